@@ -8,13 +8,25 @@ It provides type-safe configuration classes and easy access to settings.
 Author: bug6129
 """
 
-import yaml
+import json
+import os
+import tempfile
 from pathlib import Path
 from typing import List, Dict, Any
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, ValidationError
 
 
-class AppConfig(BaseModel):
+class FrozenConfig(BaseModel):
+    """
+    Base class for configuration sections - read-only once loaded.
+    
+    Frozen only blocks attribute assignment. Sections with list or dict
+    fields (and so Settings itself) are still not hashable.
+    """
+    model_config = ConfigDict(frozen=True)
+
+
+class AppConfig(FrozenConfig):
     """Application configuration settings."""
     name: str
     version: str
@@ -23,14 +35,14 @@ class AppConfig(BaseModel):
     debug: bool
 
 
-class ServerConfig(BaseModel):
+class ServerConfig(FrozenConfig):
     """Server configuration settings."""
     host: str
     port: int
     reload: bool
 
 
-class DocsConfig(BaseModel):
+class DocsConfig(FrozenConfig):
     """API documentation configuration."""
     title: str
     description: str
@@ -39,7 +51,7 @@ class DocsConfig(BaseModel):
     license: Dict[str, str]
 
 
-class CorsConfig(BaseModel):
+class CorsConfig(FrozenConfig):
     """CORS configuration settings."""
     allowed_origins: List[str]
     allowed_methods: List[str]
@@ -47,7 +59,7 @@ class CorsConfig(BaseModel):
     allow_credentials: bool
 
 
-class FeaturesConfig(BaseModel):
+class FeaturesConfig(FrozenConfig):
     """Feature flags configuration."""
     enable_user_registration: bool
     enable_product_catalog: bool
@@ -56,7 +68,7 @@ class FeaturesConfig(BaseModel):
     enable_customer_support: bool
 
 
-class BusinessConfig(BaseModel):
+class BusinessConfig(FrozenConfig):
     """Business logic configuration."""
     currency: str
     tax_rate: float
@@ -65,14 +77,14 @@ class BusinessConfig(BaseModel):
     order_timeout_minutes: int
 
 
-class DevelopmentConfig(BaseModel):
+class DevelopmentConfig(FrozenConfig):
     """Development-specific configuration."""
     create_sample_data: bool
     log_sql_queries: bool
     cors_allow_all: bool
 
 
-class Settings(BaseModel):
+class Settings(FrozenConfig):
     """Main configuration class that combines all settings."""
     app: AppConfig
     server: ServerConfig
@@ -87,6 +99,10 @@ class Settings(BaseModel):
         """
         Load configuration from YAML file.
         
+        When the FASTAPI_CONFIG_CACHE=1 environment variable is set, the
+        parsed data is also written to a `<config_file>.cache.json` sidecar
+        and reused on later starts until the YAML file is modified again.
+        
         Args:
             config_file: Path to the YAML configuration file
             
@@ -98,11 +114,58 @@ class Settings(BaseModel):
         if not config_path.exists():
             raise FileNotFoundError(f"Configuration file '{config_file}' not found")
         
-        with open(config_path, 'r', encoding='utf-8') as f:
-            config_data = yaml.safe_load(f)
+        use_cache = os.getenv("FASTAPI_CONFIG_CACHE") == "1"
+        cache_path = config_path.with_name(config_path.name + ".cache.json")
+        
+        # Reuse the JSON cache if it is at least as new as the YAML file.
+        # A damaged cache is ignored and rewritten from the YAML below.
+        if use_cache and cache_path.exists():
+            if cache_path.stat().st_mtime >= config_path.stat().st_mtime:
+                try:
+                    with open(cache_path, 'rb') as f:
+                        return cls(**json.load(f))
+                except (OSError, TypeError, ValueError, ValidationError):
+                    pass
+        
+        # Imported lazily - a fresh JSON cache never needs the YAML parser
+        import yaml
+        
+        # Prefer the LibYAML C parser when PyYAML was built with it
+        loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+        
+        with open(config_path, 'rb') as f:
+            config_data = yaml.load(f, Loader=loader)
+        
+        if use_cache:
+            cls._write_cache(cache_path, config_data)
         
         return cls(**config_data)
     
+    @staticmethod
+    def _write_cache(cache_path: Path, config_data: Dict[str, Any]) -> None:
+        """
+        Atomically write the parsed config to the JSON cache.
+        
+        The data goes to a temporary file first and is then renamed over the
+        cache, so a concurrent reader or a crash never sees a partial file.
+        """
+        try:
+            fd, tmp_path = tempfile.mkstemp(
+                dir=cache_path.parent, prefix=cache_path.name, suffix=".tmp"
+            )
+        except OSError:
+            return  # The cache is optional - a read-only config dir is fine
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(config_data, f)
+            os.replace(tmp_path, cache_path)
+        except (OSError, TypeError, ValueError):
+            # Values JSON can't represent (e.g. YAML dates) just skip the cache
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+    
     @property
     def is_development(self) -> bool:
         """Check if running in development mode."""
@@ -8,12 +8,42 @@ application with proper configuration, CORS, and foundational endpoints.
 Author: bug6129
 """
 
+import asyncio
+from contextlib import asynccontextmanager
+
+import orjson
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, Response
 from .config import settings
 from .database import create_db_and_tables
 from .routers import users
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Application lifespan handler.
+    
+    Code before the yield runs when the FastAPI application starts up,
+    code after it runs on shutdown. We'll use it for initialization and
+    cleanup tasks like database connections, cache setup, etc. in future
+    tutorials.
+    """
+    print(f"🚀 Starting {settings.app.name} v{settings.app.version}")
+    print(f"🌍 Environment: {settings.app.environment}")
+    print(f"🔧 Debug mode: {settings.app.debug}")
+    
+    # Initialize database tables (blocking DDL runs in a worker thread)
+    await asyncio.to_thread(create_db_and_tables)
+    print("📊 Database tables initialized")
+    
+    if settings.development.create_sample_data:
+        print("📊 Sample data creation enabled (will implement in future tutorials)")
+    
+    yield
+    
+    print(f"🛑 Shutting down {settings.app.name}")
+
 # Create FastAPI application with configuration from YAML
 app = FastAPI(
     title=settings.docs.title,
@@ -22,6 +52,8 @@ app = FastAPI(
     contact=settings.docs.contact,
     license_info=settings.docs.license,
     debug=settings.app.debug,
+    default_response_class=ORJSONResponse,  # orjson serializes faster than json
+    lifespan=lifespan,
 )
 
 # Add CORS middleware
@@ -36,6 +68,58 @@ app.add_middleware(
 # Include routers
 app.include_router(users.router)
 
+# Settings are frozen after loading, so these snapshots are built once
+# instead of re-dumping the config models on every request
+_SYSTEM_INFO = {
+    "app": settings.app.model_dump(),
+    "server": settings.server.model_dump(),
+    "features": settings.features.model_dump(),
+    "business": settings.business.model_dump(),
+    "development": settings.development.model_dump(),
+}
+_ENABLED_FEATURES = [
+    feature for feature, enabled in _SYSTEM_INFO["features"].items()
+    if enabled
+]
+
+# The root and health payloads depend only on settings, so they are
+# serialized once here and served as ready-made JSON bytes
+_API_INFO_BYTES = orjson.dumps({
+    "name": settings.app.name,
+    "version": settings.app.version,
+    "description": settings.app.description,
+    "status": "running",
+    "environment": settings.app.environment,
+    "features": {
+        "user_registration": settings.features.enable_user_registration,
+        "product_catalog": settings.features.enable_product_catalog,
+        "shopping_cart": settings.features.enable_shopping_cart,
+        "order_processing": settings.features.enable_order_processing,
+        "customer_support": settings.features.enable_customer_support,
+    },
+    "business": {
+        "currency": settings.business.currency,
+        "free_shipping_threshold": settings.business.free_shipping_threshold,
+    },
+    "docs": {
+        "swagger_ui": "/docs",
+        "redoc": "/redoc",
+        "openapi": "/openapi.json",
+    }
+})
+
+_HEALTH_BYTES = orjson.dumps({
+    "status": "healthy",
+    "service": settings.app.name,
+    "version": settings.app.version,
+    "environment": settings.app.environment,
+    "checks": {
+        "api": "ok",
+        "configuration": "ok",
+        # We'll add database, cache, etc. in future tutorials
+    }
+})
+
 # Root endpoint - API information
 @app.get("/", tags=["System"])
 async def api_info():
@@ -46,31 +130,9 @@ async def api_info():
     including version, features, and current status.
     
     Returns:
-        dict: API information and status
+        Response: API information and status (pre-serialized JSON)
     """
-    return {
-        "name": settings.app.name,
-        "version": settings.app.version,
-        "description": settings.app.description,
-        "status": "running",
-        "environment": settings.app.environment,
-        "features": {
-            "user_registration": settings.features.enable_user_registration,
-            "product_catalog": settings.features.enable_product_catalog,
-            "shopping_cart": settings.features.enable_shopping_cart,
-            "order_processing": settings.features.enable_order_processing,
-            "customer_support": settings.features.enable_customer_support,
-        },
-        "business": {
-            "currency": settings.business.currency,
-            "free_shipping_threshold": settings.business.free_shipping_threshold,
-        },
-        "docs": {
-            "swagger_ui": "/docs",
-            "redoc": "/redoc",
-            "openapi": "/openapi.json",
-        }
-    }
+    return Response(content=_API_INFO_BYTES, media_type="application/json")
 
 # Health check endpoint
 @app.get("/health", tags=["System"])
@@ -82,19 +144,9 @@ async def health_check():
     and container orchestration systems to check API health.
     
     Returns:
-        dict: Health status information
+        Response: Health status information (pre-serialized JSON)
     """
-    return {
-        "status": "healthy",
-        "service": settings.app.name,
-        "version": settings.app.version,
-        "environment": settings.app.environment,
-        "checks": {
-            "api": "ok",
-            "configuration": "ok",
-            # We'll add database, cache, etc. in future tutorials
-        }
-    }
+    return Response(content=_HEALTH_BYTES, media_type="application/json")
 
 # System information endpoint (useful for debugging)
 @app.get("/system", tags=["System"])
@@ -111,13 +163,7 @@ async def system_info():
     if not settings.is_development:
         return {"message": "System info only available in development mode"}
     
-    return {
-        "app": settings.app.dict(),
-        "server": settings.server.dict(),
-        "features": settings.features.dict(),
-        "business": settings.business.dict(),
-        "development": settings.development.dict(),
-    }
+    return _SYSTEM_INFO
 
 # API status endpoint
 @app.get("/status", tags=["System"])
@@ -136,10 +182,7 @@ async def api_status():
         "uptime": "Just started!",  # We'll calculate real uptime later
         "version": settings.app.version,
         "environment": settings.app.environment,
-        "features_enabled": [
-            feature for feature, enabled in settings.features.dict().items() 
-            if enabled
-        ],
+        "features_enabled": _ENABLED_FEATURES,
         "endpoints_available": {
             "system": ["/", "/health", "/system", "/status"],
             "users": ["/users/register", "/users/login", "/users/{id}", "/users/{id}/profile"],
@@ -153,36 +196,3 @@ async def api_status():
             "max_cart_items": settings.business.max_cart_items,
         }
     }
-
-# Startup event
-@app.on_event("startup")
-async def startup_event():
-    """
-    Application startup event handler.
-    
-    This function runs when the FastAPI application starts up.
-    We'll use it for initialization tasks like database connections,
-    cache setup, etc. in future tutorials.
-    """
-    print(f"🚀 Starting {settings.app.name} v{settings.app.version}")
-    print(f"🌍 Environment: {settings.app.environment}")
-    print(f"🔧 Debug mode: {settings.app.debug}")
-    
-    # Initialize database tables
-    create_db_and_tables()
-    print("📊 Database tables initialized")
-    
-    if settings.development.create_sample_data:
-        print("📊 Sample data creation enabled (will implement in future tutorials)")
-
-# Shutdown event
-@app.on_event("shutdown")
-async def shutdown_event():
-    """
-    Application shutdown event handler.
-    
-    This function runs when the FastAPI application shuts down.
-    We'll use it for cleanup tasks like closing database connections,
-    etc. in future tutorials.
-    """
-    print(f"🛑 Shutting down {settings.app.name}")
\ No newline at end of file
@@ -13,11 +13,22 @@ Run this file to see all examples in action and test the interactive API.
 Author: bug6129
 """
 
-from typing import Optional, List
-from datetime import datetime
+import json
+import re
+from typing import Annotated, Optional, List
+from datetime import datetime, timezone
 from enum import Enum
-from pydantic import BaseModel, Field, validator, EmailStr
+from pydantic import BaseModel, Field, field_validator, EmailStr, ConfigDict, ValidationInfo
 from fastapi import FastAPI, HTTPException, status
+from fastapi.responses import Response
+
+# Compiled once at import instead of on every validation
+POSTAL_CODE_PATTERN = re.compile(r'^\d{5}(-\d{4})?$')
+ORDER_ID_PATTERN = re.compile(r'^ORD-\d{8}$')
+
+def utc_now() -> datetime:
+    """Current time in UTC (timezone-aware, no local timezone lookup)."""
+    return datetime.now(timezone.utc)
 
 # Create FastAPI app for interactive testing
 app = FastAPI(
@@ -45,10 +56,9 @@ class UserProfile(BaseModel):
     is_active: bool = Field(default=True, description="Whether user account is active")
     bio: Optional[str] = Field(None, description="Optional user biography", max_length=500)
     
-    class Config:
-        """Pydantic configuration for this model."""
-        # Generate example data for API documentation
-        schema_extra = {
+    # Pydantic configuration: example data for API documentation
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "name": "Alice Johnson",
                 "email": "alice@example.com",
@@ -57,6 +67,7 @@ class UserProfile(BaseModel):
                 "bio": "Software developer who loves FastAPI and Python"
             }
         }
+    )
 
 # =============================================================================
 # 2. VALIDATION & CUSTOM VALIDATORS - Ensuring Data Quality
@@ -86,14 +97,16 @@ class Product(BaseModel):
     tags: List[str] = Field(default=[], description="Product tags for search")
     description: Optional[str] = Field(None, max_length=1000)
     
-    @validator('name')
+    @field_validator('name')
+    @classmethod
     def name_must_not_contain_special_chars(cls, v):
         """Custom validator: Product names should be clean."""
         if any(char in v for char in ['<', '>', '{', '}', '[', ']']):
             raise ValueError('Product name cannot contain special characters')
         return v.title()  # Capitalize each word
     
-    @validator('category')
+    @field_validator('category')
+    @classmethod
     def category_must_be_valid(cls, v):
         """Custom validator: Only allow specific categories."""
         allowed_categories = ['electronics', 'clothing', 'books', 'home', 'sports']
@@ -101,19 +114,22 @@ class Product(BaseModel):
             raise ValueError(f'Category must be one of: {", ".join(allowed_categories)}')
         return v.lower()
     
-    @validator('tags')
+    @field_validator('tags')
+    @classmethod
     def clean_tags(cls, v):
         """Custom validator: Clean and deduplicate tags."""
-        # Remove empty strings, convert to lowercase, remove duplicates
-        return list(set(tag.lower().strip() for tag in v if tag.strip()))
+        # Remove empty strings, convert to lowercase, remove duplicates (keeping order)
+        cleaned = [tag.strip().lower() for tag in v]
+        return list(dict.fromkeys(tag for tag in cleaned if tag))
     
-    @validator('price')
+    @field_validator('price')
+    @classmethod
     def round_price(cls, v):
         """Custom validator: Round price to 2 decimal places."""
         return round(v, 2)
     
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "name": "wireless bluetooth headphones",
                 "price": 99.99,
@@ -123,6 +139,7 @@ class Product(BaseModel):
                 "description": "High-quality wireless headphones with noise cancellation"
             }
         }
+    )
 
 # =============================================================================
 # 3. NESTED MODELS & RELATIONSHIPS - Complex Data Structures
@@ -136,11 +153,11 @@ class Address(BaseModel):
     postal_code: str = Field(..., description="Postal/ZIP code", max_length=20)
     country: str = Field(default="USA", description="Country name")
     
-    @validator('postal_code')
+    @field_validator('postal_code')
+    @classmethod
     def validate_postal_code(cls, v):
         """Simple postal code validation (US format)."""
-        import re
-        if not re.match(r'^\d{5}(-\d{4})?$', v):
+        if not POSTAL_CODE_PATTERN.match(v):
             raise ValueError('Invalid postal code format (use XXXXX or XXXXX-XXXX)')
         return v
 
@@ -167,20 +184,21 @@ class Order(BaseModel):
     """
     order_id: str = Field(..., description="Unique order identifier")
     customer_email: EmailStr = Field(..., description="Customer email address")
-    items: List[OrderItem] = Field(..., description="List of ordered items", min_items=1)
+    items: Annotated[List[OrderItem], Field(description="List of ordered items", min_length=1)]
     shipping_address: Address = Field(..., description="Shipping address")
-    order_date: datetime = Field(default_factory=datetime.now, description="Order timestamp")
+    order_date: datetime = Field(default_factory=utc_now, description="Order timestamp")
     notes: Optional[str] = Field(None, max_length=500)
     
-    @validator('order_id')
+    @field_validator('order_id')
+    @classmethod
     def validate_order_id(cls, v):
         """Validate order ID format."""
-        import re
-        if not re.match(r'^ORD-\d{8}$', v):
+        if not ORDER_ID_PATTERN.match(v):
             raise ValueError('Order ID must be in format: ORD-XXXXXXXX')
         return v
     
-    @validator('items')
+    @field_validator('items')
+    @classmethod
     def validate_items_not_empty(cls, v):
         """Ensure order has at least one item."""
         if not v:
@@ -197,8 +215,8 @@ class Order(BaseModel):
         """Get total number of items in order."""
         return sum(item.quantity for item in self.items)
     
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "order_id": "ORD-12345678",
                 "customer_email": "customer@example.com",
@@ -224,6 +242,7 @@ class Order(BaseModel):
                 "notes": "Please handle with care"
             }
         }
+    )
 
 # =============================================================================
 # 4. RESPONSE MODELS - Structuring API Outputs
@@ -236,7 +255,7 @@ class UserResponse(BaseModel):
     age: int
     is_active: bool
     bio: Optional[str]
-    member_since: datetime = Field(default_factory=datetime.now)
+    member_since: datetime = Field(default_factory=utc_now)
 
 class ProductResponse(BaseModel):
     """Response model for product data with computed fields."""
@@ -246,12 +265,13 @@ class ProductResponse(BaseModel):
     status: ProductStatus
     tags: List[str]
     description: Optional[str]
-    is_available: bool = True
+    is_available: bool = Field(default=True, validate_default=True)
     
-    @validator('is_available', pre=True, always=True)
-    def compute_availability(cls, v, values):
+    @field_validator('is_available', mode='before')
+    @classmethod
+    def compute_availability(cls, v, info: ValidationInfo):
         """Compute availability based on status."""
-        status = values.get('status')
+        status = info.data.get('status')
         return status in [ProductStatus.ACTIVE]
 
 class OrderResponse(BaseModel):
@@ -269,19 +289,21 @@ class OrderResponse(BaseModel):
 # 5. API ENDPOINTS - Putting It All Together
 # =============================================================================
 
+_ROOT_JSON = json.dumps({
+    "message": "Pydantic Fundamentals Tutorial API",
+    "available_endpoints": {
+        "users": "/users/ (POST, GET)",
+        "products": "/products/ (POST, GET)",
+        "orders": "/orders/ (POST, GET)",
+        "examples": "/examples/ (GET)",
+    },
+    "documentation": "/docs"
+}).encode()
+
 @app.get("/", tags=["Demo"])
 async def root():
     """API root with information about available endpoints."""
-    return {
-        "message": "Pydantic Fundamentals Tutorial API",
-        "available_endpoints": {
-            "users": "/users/ (POST, GET)",
-            "products": "/products/ (POST, GET)",
-            "orders": "/orders/ (POST, GET)",
-            "examples": "/examples/ (GET)",
-        },
-        "documentation": "/docs"
-    }
+    return Response(content=_ROOT_JSON, media_type="application/json")
 
 # User endpoints demonstrating basic validation
 @app.post("/users/", response_model=UserResponse, tags=["Users"])
@@ -295,22 +317,25 @@ async def create_user(user: UserProfile):
     - Response model that excludes sensitive fields
     """
     # In a real app, you'd save to database here
-    response_data = user.dict()
-    response_data['member_since'] = datetime.now()
-    return UserResponse(**response_data)
+    # user is already validated, so reuse its fields instead of re-validating a dump
+    return UserResponse.model_construct(**user.__dict__, member_since=utc_now())
+
+# Example payloads never change, so each one is built and serialized once
+# at import; member_since/order_date are stamped at startup
+_EXAMPLE_USER = UserProfile(
+    name="John Doe",
+    email="john@example.com",
+    age=30,
+    bio="Example user for demonstration purposes"
+)
+_EXAMPLE_USER_JSON = UserResponse.model_construct(
+    **_EXAMPLE_USER.__dict__, member_since=utc_now()
+).model_dump_json().encode()
 
 @app.get("/users/example", response_model=UserResponse, tags=["Users"])
 async def get_example_user():
     """Get an example user for testing purposes."""
-    example_user = UserProfile(
-        name="John Doe",
-        email="john@example.com",
-        age=30,
-        bio="Example user for demonstration purposes"
-    )
-    response_data = example_user.dict()
-    response_data['member_since'] = datetime.now()
-    return UserResponse(**response_data)
+    return Response(content=_EXAMPLE_USER_JSON, media_type="application/json")
 
 # Product endpoints demonstrating advanced validation
 @app.post("/products/", response_model=ProductResponse, tags=["Products"])
@@ -325,20 +350,21 @@ async def create_product(product: Product):
     - Data transformation during validation
     """
     # The custom validators will automatically clean and validate the data
-    response_data = product.dict()
-    return ProductResponse(**response_data)
+    return ProductResponse(**product.__dict__)
+
+_EXAMPLE_PRODUCT = Product(
+    name="amazing wireless headphones",
+    price=149.99,
+    category="ELECTRONICS",  # Will be converted to lowercase
+    tags=["bluetooth", "WIRELESS", " audio ", "bluetooth"],  # Will be cleaned
+    description="High-quality headphones with excellent sound"
+)
+_EXAMPLE_PRODUCT_JSON = ProductResponse(**_EXAMPLE_PRODUCT.__dict__).model_dump_json().encode()
 
 @app.get("/products/example", response_model=ProductResponse, tags=["Products"])
 async def get_example_product():
     """Get an example product for testing purposes."""
-    example_product = Product(
-        name="amazing wireless headphones",
-        price=149.99,
-        category="ELECTRONICS",  # Will be converted to lowercase
-        tags=["bluetooth", "WIRELESS", " audio ", "bluetooth"],  # Will be cleaned
-        description="High-quality headphones with excellent sound"
-    )
-    return ProductResponse(**example_product.dict())
+    return Response(content=_EXAMPLE_PRODUCT_JSON, media_type="application/json")
 
 # Order endpoints demonstrating nested models
 @app.post("/orders/", response_model=OrderResponse, tags=["Orders"])
@@ -352,36 +378,69 @@ async def create_order(order: Order):
     - Custom validators for complex fields
     - Computed properties in response
     """
-    response_data = order.dict()
-    response_data['total_amount'] = order.total_amount
-    response_data['item_count'] = order.item_count
-    return OrderResponse(**response_data)
+    return OrderResponse.model_construct(
+        **order.__dict__,
+        total_amount=order.total_amount,
+        item_count=order.item_count
+    )
+
+_EXAMPLE_ORDER = Order(
+    order_id="ORD-87654321",
+    customer_email="customer@test.com",
+    items=[
+        OrderItem(product_name="Laptop", quantity=1, unit_price=999.99),
+        OrderItem(product_name="Mouse", quantity=2, unit_price=25.50)
+    ],
+    shipping_address=Address(
+        street="456 Oak Avenue",
+        city="Springfield",
+        state="IL",
+        postal_code="62701"
+    ),
+    notes="Rush delivery requested"
+)
+_EXAMPLE_ORDER_JSON = OrderResponse.model_construct(
+    **_EXAMPLE_ORDER.__dict__,
+    total_amount=_EXAMPLE_ORDER.total_amount,
+    item_count=_EXAMPLE_ORDER.item_count
+).model_dump_json().encode()
 
 @app.get("/orders/example", response_model=OrderResponse, tags=["Orders"])
 async def get_example_order():
     """Get an example order for testing purposes."""
-    example_order = Order(
-        order_id="ORD-87654321",
-        customer_email="customer@test.com",
-        items=[
-            OrderItem(product_name="Laptop", quantity=1, unit_price=999.99),
-            OrderItem(product_name="Mouse", quantity=2, unit_price=25.50)
-        ],
-        shipping_address=Address(
-            street="456 Oak Avenue",
-            city="Springfield",
-            state="IL",
-            postal_code="62701"
-        ),
-        notes="Rush delivery requested"
-    )
-    
-    response_data = example_order.dict()
-    response_data['total_amount'] = example_order.total_amount
-    response_data['item_count'] = example_order.item_count
-    return OrderResponse(**response_data)
+    return Response(content=_EXAMPLE_ORDER_JSON, media_type="application/json")
+
+# Educational endpoints (static content, serialized once at import and
+# safe for clients and proxies to cache)
+_STATIC_CACHE_HEADERS = {"Cache-Control": "public, max-age=3600"}
+_VALIDATION_ERROR_EXAMPLES_JSON = json.dumps({
+    "validation_examples": {
+        "user_errors": {
+            "invalid_email": "Use valid email format: user@example.com",
+            "age_too_young": "Age must be at least 13",
+            "age_too_old": "Age must be at most 120",
+            "name_too_short": "Name must be at least 2 characters"
+        },
+        "product_errors": {
+            "invalid_price": "Price must be greater than 0",
+            "invalid_category": "Category must be one of: electronics, clothing, books, home, sports",
+            "special_chars_in_name": "Product name cannot contain < > { } [ ]"
+        },
+        "order_errors": {
+            "invalid_order_id": "Order ID must be in format: ORD-XXXXXXXX",
+            "invalid_postal_code": "Use format: 12345 or 12345-6789",
+            "empty_items": "Order must contain at least one item"
+        }
+    },
+    "tips": [
+        "Always use type hints - they enable Pydantic validation",
+        "Use Field() for additional validation constraints",
+        "Custom validators run after basic type validation",
+        "Pydantic automatically converts compatible types",
+        "Use response models to control API output"
+    ]
+}).encode()
 
-# Educational endpoints
 @app.get("/examples/validation-errors", tags=["Examples"])
 async def validation_error_examples():
     """
@@ -389,61 +448,45 @@ async def validation_error_examples():
     
     This endpoint provides educational content about Pydantic validation.
     """
-    return {
-        "validation_examples": {
-            "user_errors": {
-                "invalid_email": "Use valid email format: user@example.com",
-                "age_too_young": "Age must be at least 13",
-                "age_too_old": "Age must be at most 120",
-                "name_too_short": "Name must be at least 2 characters"
-            },
-            "product_errors": {
-                "invalid_price": "Price must be greater than 0",
-                "invalid_category": "Category must be one of: electronics, clothing, books, home, sports",
-                "special_chars_in_name": "Product name cannot contain < > { } [ ]"
-            },
-            "order_errors": {
-                "invalid_order_id": "Order ID must be in format: ORD-XXXXXXXX",
-                "invalid_postal_code": "Use format: 12345 or 12345-6789",
-                "empty_items": "Order must contain at least one item"
-            }
+    return Response(
+        content=_VALIDATION_ERROR_EXAMPLES_JSON,
+        media_type="application/json",
+        headers=_STATIC_CACHE_HEADERS
+    )
+
+_MODEL_FEATURES_JSON = json.dumps({
+    "pydantic_features": {
+        "field_validation": {
+            "min_length": "Field(min_length=3) - minimum string length",
+            "max_length": "Field(max_length=100) - maximum string length", 
+            "ge": "Field(ge=0) - greater than or equal to",
+            "gt": "Field(gt=0) - greater than",
+            "le": "Field(le=100) - less than or equal to",
+            "lt": "Field(lt=100) - less than"
+        },
+        "custom_validators": {
+            "before": "@field_validator('field', mode='before') - runs before type validation",
+            "validate_default": "Field(validate_default=True) - validators also run on default values",
+            "model_validator": "@model_validator(mode='after') - validates the whole model after its fields"
         },
-        "tips": [
-            "Always use type hints - they enable Pydantic validation",
-            "Use Field() for additional validation constraints",
-            "Custom validators run after basic type validation",
-            "Pydantic automatically converts compatible types",
-            "Use response models to control API output"
-        ]
+        "model_config": {
+            "json_schema_extra": "Add example data for API docs",
+            "populate_by_name": "Allow using field names or aliases",
+            "validate_assignment": "Re-validate when fields are changed after creation"
+        }
     }
+}).encode()
 
 @app.get("/examples/model-features", tags=["Examples"])
 async def model_features_examples():
     """
     Examples of advanced Pydantic model features.
     """
-    return {
-        "pydantic_features": {
-            "field_validation": {
-                "min_length": "Field(min_length=3) - minimum string length",
-                "max_length": "Field(max_length=100) - maximum string length", 
-                "ge": "Field(ge=0) - greater than or equal to",
-                "gt": "Field(gt=0) - greater than",
-                "le": "Field(le=100) - less than or equal to",
-                "lt": "Field(lt=100) - less than"
-            },
-            "custom_validators": {
-                "pre": "@validator('field', pre=True) - runs before type validation",
-                "always": "@validator('field', always=True) - always runs even if field not provided",
-                "each_item": "@validator('list_field', each_item=True) - validates each item in list"
-            },
-            "model_config": {
-                "schema_extra": "Add example data for API docs",
-                "allow_population_by_field_name": "Allow using field names or aliases",
-                "validate_assignment": "Re-validate when fields are changed after creation"
-            }
-        }
-    }
+    return Response(
+        content=_MODEL_FEATURES_JSON,
+        media_type="application/json",
+        headers=_STATIC_CACHE_HEADERS
+    )
 
 # Health check endpoint
 @app.get("/health", tags=["System"])
@@ -452,7 +495,7 @@ async def health_check():
     return {
         "status": "healthy",
         "service": "Pydantic Fundamentals Tutorial",
-        "timestamp": datetime.now()
+        "timestamp": utc_now()
     }
 
 # Main execution
@@ -17,18 +17,30 @@ Key Concepts Demonstrated:
 Author: bug6129
 """
 
-from typing import List, Optional
+import json
+from typing import Dict, List, Optional, Set
+from collections import defaultdict
+from contextlib import asynccontextmanager
 from datetime import datetime
+from itertools import count, islice
 from enum import Enum
 from pydantic import BaseModel, Field
 from fastapi import FastAPI, HTTPException, status, Query
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Load the sample tasks when the server starts instead of at import time."""
+    if not tasks_db:
+        create_sample_tasks()
+    yield
 
 # Create FastAPI app
 app = FastAPI(
     title="CRUD Fundamentals - Task Manager",
     description="Learn CRUD operations through a simple task management API",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # =============================================================================
@@ -49,6 +61,10 @@ class TaskPriority(str, Enum):
     HIGH = "high"
     URGENT = "urgent"
 
+# Enum members in definition order, listed once for the statistics endpoint
+TASK_STATUSES = tuple(TaskStatus)
+TASK_PRIORITIES = tuple(TaskPriority)
+
 class TaskBase(BaseModel):
     """Base task model with shared fields."""
     title: str = Field(..., description="Task title", min_length=1, max_length=200)
@@ -94,14 +110,16 @@ class Task(TaskBase):
 # =============================================================================
 
 # In-memory task storage (in production, you'd use a database)
-tasks_db: List[Task] = []
-next_task_id = 1
+# Tasks are keyed by ID, with secondary indexes of task IDs by status and
+# priority so lookups and filters don't have to scan every task
+tasks_db: Dict[int, Task] = {}
+status_index: Dict[TaskStatus, Set[int]] = defaultdict(set)
+priority_index: Dict[TaskPriority, Set[int]] = defaultdict(set)
+task_ids = count(1)  # Auto-incrementing ID generator
 
 # Sample data for demonstration
 def create_sample_tasks():
     """Create some sample tasks for demonstration."""
-    global next_task_id
-    
     sample_tasks = [
         TaskCreate(
             title="Set up development environment",
@@ -136,18 +154,16 @@ def create_sample_tasks():
         )
     ]
     
+    now = datetime.now()  # One timestamp for the whole batch
     for task_data in sample_tasks:
-        task = Task(
-            id=next_task_id,
-            **task_data.dict(),
-            created_at=datetime.now(),
-            updated_at=datetime.now()
+        # TaskCreate already validated these fields, so skip revalidation
+        task = Task.model_construct(
+            id=next(task_ids),
+            **task_data.__dict__,
+            created_at=now,
+            updated_at=now
         )
-        tasks_db.append(task)
-        next_task_id += 1
-
-# Initialize with sample data
-create_sample_tasks()
+        save_task(task)
 
 # =============================================================================
 # 3. HELPER FUNCTIONS - Utility Functions
@@ -155,42 +171,75 @@ create_sample_tasks()
 
 def find_task_by_id(task_id: int) -> Optional[Task]:
     """Find a task by its ID."""
-    return next((task for task in tasks_db if task.id == task_id), None)
+    return tasks_db.get(task_id)
+
+def save_task(task: Task) -> None:
+    """Insert or replace a task, keeping the status/priority indexes in sync."""
+    existing_task = tasks_db.get(task.id)
+    if existing_task:
+        status_index[existing_task.status].discard(task.id)
+        priority_index[existing_task.priority].discard(task.id)
+    tasks_db[task.id] = task
+    status_index[task.status].add(task.id)
+    priority_index[task.priority].add(task.id)
+
+def update_task_fields(task: Task, changes: dict) -> Task:
+    """Update a stored task in place, keeping the status/priority indexes in sync."""
+    status_index[task.status].discard(task.id)
+    priority_index[task.priority].discard(task.id)
+    for field, value in changes.items():
+        setattr(task, field, value)
+    task.updated_at = datetime.now()
+    status_index[task.status].add(task.id)
+    priority_index[task.priority].add(task.id)
+    return task
 
-def get_task_index(task_id: int) -> int:
-    """Get the index of a task in the tasks list."""
-    for i, task in enumerate(tasks_db):
-        if task.id == task_id:
-            return i
-    return -1
+def remove_task(task_id: int) -> Optional[Task]:
+    """Remove a task and its index entries, returning it if it existed."""
+    task = tasks_db.pop(task_id, None)
+    if task:
+        status_index[task.status].discard(task_id)
+        priority_index[task.priority].discard(task_id)
+    return task
+
+def clear_tasks() -> None:
+    """Remove all tasks and reset the indexes."""
+    tasks_db.clear()
+    status_index.clear()
+    priority_index.clear()
 
 # =============================================================================
 # 4. API ENDPOINTS - CRUD Operations
 # =============================================================================
 
+# Everything except the task count is static, so it's only built once
+_ROOT_INFO = {
+    "message": "Task Manager API - CRUD Fundamentals",
+    "description": "Learn CRUD operations through task management",
+    "endpoints": {
+        "GET /tasks": "List all tasks (with optional filtering)",
+        "POST /tasks": "Create a new task",
+        "GET /tasks/{id}": "Get a specific task by ID",
+        "PUT /tasks/{id}": "Update a task completely",
+        "PATCH /tasks/{id}": "Update specific task fields",
+        "DELETE /tasks/{id}": "Delete a task"
+    },
+    "documentation": "/docs"
+}
+
 @app.get("/", tags=["Info"])
 async def root():
     """API information and available endpoints."""
-    return {
-        "message": "Task Manager API - CRUD Fundamentals",
-        "description": "Learn CRUD operations through task management",
-        "endpoints": {
-            "GET /tasks": "List all tasks (with optional filtering)",
-            "POST /tasks": "Create a new task",
-            "GET /tasks/{id}": "Get a specific task by ID",
-            "PUT /tasks/{id}": "Update a task completely",
-            "PATCH /tasks/{id}": "Update specific task fields",
-            "DELETE /tasks/{id}": "Delete a task"
-        },
-        "total_tasks": len(tasks_db),
-        "documentation": "/docs"
-    }
+    return Response(
+        content=json.dumps({**_ROOT_INFO, "total_tasks": len(tasks_db)}).encode(),
+        media_type="application/json"
+    )
 
 # =============================================================================
 # READ OPERATIONS - Getting Data
 # =============================================================================
 
-@app.get("/tasks", response_model=List[Task], tags=["Tasks"])
+@app.get("/tasks", response_model=List[Task], response_model_exclude_none=True, tags=["Tasks"])
 async def get_tasks(
     status: Optional[TaskStatus] = Query(None, description="Filter by task status"),
     priority: Optional[TaskPriority] = Query(None, description="Filter by task priority"),
@@ -206,22 +255,67 @@ async def get_tasks(
     - List operations
     - Optional filtering logic
     """
-    filtered_tasks = tasks_db
+    # No filters: paginate straight over the stored tasks (in creation order)
+    if not status and not priority:
+        if skip == 0 and limit >= len(tasks_db):
+            return list(tasks_db.values())  # Common case: the whole list fits in one page
+        return list(islice(tasks_db.values(), skip, skip + limit))
     
-    # Apply status filter
-    if status:
-        filtered_tasks = [task for task in filtered_tasks if task.status == status]
+    # Apply status and priority filters by intersecting the index sets
+    if status and priority:
+        matching_ids = status_index[status] & priority_index[priority]
+    elif status:
+        matching_ids = status_index[status]
+    else:
+        matching_ids = priority_index[priority]
     
-    # Apply priority filter
-    if priority:
-        filtered_tasks = [task for task in filtered_tasks if task.priority == priority]
+    # Apply pagination (IDs are sorted to keep creation order)
+    paginated_ids = sorted(matching_ids)[skip:skip + limit]
     
-    # Apply pagination
-    paginated_tasks = filtered_tasks[skip:skip + limit]
+    return [tasks_db[task_id] for task_id in paginated_ids]
+
+@app.get("/tasks/stats", tags=["Statistics"])
+async def get_task_statistics():
+    """
+    Get task statistics.
+    
+    Demonstrates data aggregation and analysis.
     
-    return paginated_tasks
+    Registered before /tasks/{task_id} so "stats" isn't parsed as a task ID.
+    """
+    total_tasks = len(tasks_db)
+    
+    if total_tasks == 0:
+        return {"message": "No tasks found"}
+    
+    # Count by status and priority (read straight from the indexes)
+    status_counts = {
+        status.value: len(status_index[status]) for status in TASK_STATUSES
+    }
+    priority_counts = {
+        priority.value: len(priority_index[priority]) for priority in TASK_PRIORITIES
+    }
+    
+    # Count overdue tasks in a single pass (no intermediate list); enum
+    # members are singletons, so an identity check is enough
+    now = datetime.now()
+    completed = TaskStatus.COMPLETED
+    overdue_count = sum(
+        1 for t in tasks_db.values()
+        if t.due_date and t.due_date < now and t.status is not completed
+    )
+    
+    return {
+        "total_tasks": total_tasks,
+        "status_breakdown": status_counts,
+        "priority_breakdown": priority_counts,
+        "overdue_tasks": overdue_count,
+        "completion_rate": round(
+            (status_counts.get("completed", 0) / total_tasks) * 100, 2
+        ) if total_tasks > 0 else 0
+    }
 
-@app.get("/tasks/{task_id}", response_model=Task, tags=["Tasks"])
+@app.get("/tasks/{task_id}", response_model=Task, response_model_exclude_none=True, tags=["Tasks"])
 async def get_task(task_id: int):
     """
     Get a specific task by its ID.
@@ -255,19 +349,20 @@ async def create_task(task_data: TaskCreate):
     - 201 Created status code
     - Timestamps
     """
-    global next_task_id
-    
     # Create new task with auto-generated ID and timestamps
-    new_task = Task(
-        id=next_task_id,
-        **task_data.dict(),
-        created_at=datetime.now(),
-        updated_at=datetime.now()
+    # (created_at and updated_at share a single clock read)
+    now = datetime.now()
+    
+    # task_data was validated by FastAPI, so build the Task without revalidating
+    new_task = Task.model_construct(
+        id=next(task_ids),
+        **task_data.__dict__,
+        created_at=now,
+        updated_at=now
     )
     
     # Add to storage
-    tasks_db.append(new_task)
-    next_task_id += 1
+    save_task(new_task)
     
     return new_task
 
@@ -286,26 +381,24 @@ async def update_task_complete(task_id: int, task_data: TaskCreate):
     - Complete resource replacement
     - Updated timestamps
     """
-    task_index = get_task_index(task_id)
-    if task_index == -1:
+    # Get the existing task to preserve ID and created_at
+    existing_task = find_task_by_id(task_id)
+    if not existing_task:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Task with ID {task_id} not found"
         )
     
-    # Get the existing task to preserve ID and created_at
-    existing_task = tasks_db[task_index]
-    
     # Create updated task (complete replacement)
-    updated_task = Task(
+    updated_task = Task.model_construct(
         id=existing_task.id,
-        **task_data.dict(),
+        **task_data.__dict__,
         created_at=existing_task.created_at,
         updated_at=datetime.now()
     )
     
     # Replace in storage
-    tasks_db[task_index] = updated_task
+    save_task(updated_task)
     
     return updated_task
 
@@ -320,28 +413,17 @@ async def update_task_partial(task_id: int, task_data: TaskUpdate):
     - Preserving unchanged fields
     - Conditional field updates
     """
-    task_index = get_task_index(task_id)
-    if task_index == -1:
+    existing_task = find_task_by_id(task_id)
+    if not existing_task:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Task with ID {task_id} not found"
         )
     
-    existing_task = tasks_db[task_index]
-    
-    # Update only provided fields
-    update_data = task_data.dict(exclude_unset=True)
-    
-    # Create updated task preserving unchanged fields
-    updated_task = existing_task.copy(update={
-        **update_data,
-        "updated_at": datetime.now()
-    })
+    # Update only provided fields, in place (unchanged fields are untouched)
+    update_data = task_data.model_dump(exclude_unset=True)
     
-    # Replace in storage
-    tasks_db[task_index] = updated_task
-    
-    return updated_task
+    return update_task_fields(existing_task, update_data)
 
 # =============================================================================
 # DELETE OPERATIONS - Removing Data
@@ -358,16 +440,14 @@ async def delete_task(task_id: int):
     - Success confirmation
     - 404 handling for non-existent resources
     """
-    task_index = get_task_index(task_id)
-    if task_index == -1:
+    # Remove from storage
+    deleted_task = remove_task(task_id)
+    if not deleted_task:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Task with ID {task_id} not found"
         )
     
-    # Remove from storage
-    deleted_task = tasks_db.pop(task_index)
-    
     return JSONResponse(
         status_code=status.HTTP_200_OK,
         content={
@@ -380,15 +460,14 @@ async def delete_task(task_id: int):
 # ADDITIONAL ENDPOINTS - Bonus Features
 # =============================================================================
 
-@app.get("/tasks/status/{status}", response_model=List[Task], tags=["Tasks"])
+@app.get("/tasks/status/{status}", response_model=List[Task], response_model_exclude_none=True, tags=["Tasks"])
 async def get_tasks_by_status(status: TaskStatus):
     """
     Get all tasks with a specific status.
     
     Alternative endpoint design for status filtering.
     """
-    filtered_tasks = [task for task in tasks_db if task.status == status]
-    return filtered_tasks
+    return [tasks_db[task_id] for task_id in sorted(status_index[status])]
 
 @app.patch("/tasks/{task_id}/status", response_model=Task, tags=["Tasks"])
 async def update_task_status(task_id: int, new_status: TaskStatus):
@@ -397,60 +476,14 @@ async def update_task_status(task_id: int, new_status: TaskStatus):
     
     Demonstrates specific field update endpoint.
     """
-    task_index = get_task_index(task_id)
-    if task_index == -1:
+    existing_task = find_task_by_id(task_id)
+    if not existing_task:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Task with ID {task_id} not found"
         )
     
-    existing_task = tasks_db[task_index]
-    updated_task = existing_task.copy(update={
-        "status": new_status,
-        "updated_at": datetime.now()
-    })
-    
-    tasks_db[task_index] = updated_task
-    return updated_task
-
-@app.get("/tasks/stats", tags=["Statistics"])
-async def get_task_statistics():
-    """
-    Get task statistics.
-    
-    Demonstrates data aggregation and analysis.
-    """
-    total_tasks = len(tasks_db)
-    
-    if total_tasks == 0:
-        return {"message": "No tasks found"}
-    
-    # Count by status
-    status_counts = {}
-    for status in TaskStatus:
-        status_counts[status.value] = len([t for t in tasks_db if t.status == status])
-    
-    # Count by priority
-    priority_counts = {}
-    for priority in TaskPriority:
-        priority_counts[priority.value] = len([t for t in tasks_db if t.priority == priority])
-    
-    # Find overdue tasks
-    now = datetime.now()
-    overdue_tasks = [
-        t for t in tasks_db 
-        if t.due_date and t.due_date < now and t.status != TaskStatus.COMPLETED
-    ]
-    
-    return {
-        "total_tasks": total_tasks,
-        "status_breakdown": status_counts,
-        "priority_breakdown": priority_counts,
-        "overdue_tasks": len(overdue_tasks),
-        "completion_rate": round(
-            (status_counts.get("completed", 0) / total_tasks) * 100, 2
-        ) if total_tasks > 0 else 0
-    }
+    return update_task_fields(existing_task, {"status": new_status})
 
 @app.delete("/tasks", tags=["Tasks"])
 async def delete_all_tasks():
@@ -460,7 +493,7 @@ async def delete_all_tasks():
     Demonstrates bulk operations and confirmation.
     """
     deleted_count = len(tasks_db)
-    tasks_db.clear()
+    clear_tasks()
     
     return JSONResponse(
         status_code=status.HTTP_200_OK,
@@ -477,9 +510,9 @@ async def reset_tasks():
     
     Useful for testing and demonstrations.
     """
-    global next_task_id
-    tasks_db.clear()
-    next_task_id = 1
+    global task_ids
+    clear_tasks()
+    task_ids = count(1)
     create_sample_tasks()
     
     return JSONResponse(
@@ -503,6 +536,7 @@ async def health_check():
 
 # Main execution
 if __name__ == "__main__":
+    import os
     import uvicorn
     print("🚀 CRUD Fundamentals - Task Manager API")
     print("=" * 50)
@@ -533,4 +567,13 @@ if __name__ == "__main__":
     print("Press CTRL+C to quit")
     print("=" * 50)
     
-    uvicorn.run(app, host="127.0.0.1", port=8000, reload=True)
\ No newline at end of file
+    # Auto-reload is a development convenience - enable it with RELOAD=1.
+    # uvicorn picks uvloop and httptools automatically when they're installed.
+    # app_dir lets "main:app" resolve even when started from another directory.
+    uvicorn.run(
+        "main:app",
+        host="127.0.0.1",
+        port=8000,
+        reload=os.getenv("RELOAD") == "1",
+        app_dir=os.path.dirname(os.path.abspath(__file__))
+    )
\ No newline at end of file
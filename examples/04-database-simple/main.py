@@ -17,13 +17,17 @@ Key Concepts Demonstrated:
 Author: bug6129
 """
 
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from datetime import datetime
 from enum import Enum
-from sqlmodel import SQLModel, Field, create_engine, Session, select
+from sqlmodel import SQLModel, Field, create_engine, Session, select, delete, func
+from sqlalchemy import column, event, text
+from sqlalchemy.exc import OperationalError
 from fastapi import FastAPI, HTTPException, status, Depends, Query
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
+import json
 import os
+import re
 
 # Create FastAPI app
 app = FastAPI(
@@ -49,7 +53,7 @@ class ContactBase(SQLModel):
     last_name: str = Field(..., description="Contact's last name", max_length=50)
     email: Optional[str] = Field(None, description="Email address", max_length=255)
     phone: Optional[str] = Field(None, description="Phone number", max_length=20)
-    contact_type: ContactType = Field(default=ContactType.PERSONAL, description="Type of contact")
+    contact_type: ContactType = Field(default=ContactType.PERSONAL, description="Type of contact", index=True)
     company: Optional[str] = Field(None, description="Company name", max_length=100)
     notes: Optional[str] = Field(None, description="Additional notes", max_length=500)
 
@@ -57,9 +61,12 @@ class Contact(ContactBase, table=True):
     """Contact database table model."""
     
     __tablename__ = "contacts"
+    # RELOAD=1 imports this module twice in the server process (as the
+    # spawned __main__ and as "main"), so allow the table to be redefined
+    __table_args__ = {"extend_existing": True}
     
     id: Optional[int] = Field(default=None, primary_key=True, description="Unique contact ID")
-    created_at: datetime = Field(default_factory=datetime.utcnow, description="Creation timestamp")
+    created_at: datetime = Field(default_factory=datetime.utcnow, description="Creation timestamp", index=True)
     updated_at: datetime = Field(default_factory=datetime.utcnow, description="Last update timestamp")
     
     class Config:
@@ -116,9 +123,83 @@ engine = create_engine(
     connect_args={"check_same_thread": False}  # Needed for SQLite
 )
 
+@event.listens_for(engine, "connect")
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    """
+    Tune every new SQLite connection.
+    
+    WAL lets readers keep going while a write is in progress, and
+    synchronous=NORMAL only fsyncs at checkpoints instead of on every commit.
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA mmap_size=268435456")  # 256 MB
+    cursor.execute("PRAGMA cache_size=-65536")  # 64 MB
+    cursor.execute("PRAGMA busy_timeout=30000")  # wait up to 30s for locks
+    cursor.close()
+
 def create_db_and_tables():
     """Create database tables."""
     SQLModel.metadata.create_all(engine)
+    # create_all skips tables that already exist, so add any indexes that
+    # were introduced after the database file was created
+    for index in Contact.__table__.indexes:
+        index.create(engine, checkfirst=True)
+
+# Full-text search index over the columns contact search looks at (names and
+# email). It is an external-content FTS5
+# table: the text stays in "contacts" and the triggers keep the index in sync.
+FTS_SETUP_STATEMENTS = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS contacts_fts USING fts5(
+        first_name, last_name, email,
+        content='contacts', content_rowid='id', tokenize='unicode61'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS contacts_fts_insert AFTER INSERT ON contacts BEGIN
+        INSERT INTO contacts_fts(rowid, first_name, last_name, email)
+        VALUES (new.id, new.first_name, new.last_name, new.email);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS contacts_fts_delete AFTER DELETE ON contacts BEGIN
+        INSERT INTO contacts_fts(contacts_fts, rowid, first_name, last_name, email)
+        VALUES ('delete', old.id, old.first_name, old.last_name, old.email);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS contacts_fts_update AFTER UPDATE ON contacts BEGIN
+        INSERT INTO contacts_fts(contacts_fts, rowid, first_name, last_name, email)
+        VALUES ('delete', old.id, old.first_name, old.last_name, old.email);
+        INSERT INTO contacts_fts(rowid, first_name, last_name, email)
+        VALUES (new.id, new.first_name, new.last_name, new.email);
+    END
+    """,
+]
+
+def create_search_index() -> bool:
+    """
+    Create the FTS5 search index and its sync triggers.
+    
+    Returns False if this SQLite build has no FTS5 support, in which case
+    search falls back to LIKE queries.
+    """
+    try:
+        with engine.begin() as connection:
+            index_exists = connection.exec_driver_sql(
+                "SELECT 1 FROM sqlite_master WHERE name = 'contacts_fts'"
+            ).first()
+            for statement in FTS_SETUP_STATEMENTS:
+                connection.exec_driver_sql(statement)
+            if not index_exists:
+                # Index contacts that were stored before the index existed
+                connection.exec_driver_sql("INSERT INTO contacts_fts(contacts_fts) VALUES ('rebuild')")
+    except OperationalError:
+        return False
+    return True
 
 def get_session():
     """
@@ -132,11 +213,49 @@ def get_session():
 
 # Initialize database
 create_db_and_tables()
+FTS_ENABLED = create_search_index()
 
 # =============================================================================
 # 3. DATABASE OPERATIONS - CRUD with SQLModel
 # =============================================================================
 
+# Bumped after every write so cached statistics know when they are stale.
+# The cache lives in this process, so it assumes a single server process.
+_contacts_version = 0
+_stats_cache: Optional[Tuple[int, bytes]] = None
+
+def mark_contacts_changed():
+    """Invalidate cached statistics after contacts were written."""
+    global _contacts_version
+    _contacts_version += 1
+
+# List endpoints select the response columns directly: plain rows are much
+# cheaper to load than full ORM objects, and they validate into ContactResponse
+# the same way
+CONTACT_LIST_COLUMNS = [Contact.__table__.c[name] for name in ContactResponse.model_fields]
+
+def contact_search_filter(search_term: str):
+    """
+    Build a WHERE clause matching first name, last name or email.
+    
+    With FTS5 every word is matched as a word prefix through the search
+    index, so "john" finds "Johnson" but "son" doesn't. Without FTS5 this
+    falls back to substring LIKE matching (a full table scan).
+    """
+    words = re.findall(r"[^\W_]+", search_term)
+    if FTS_ENABLED and words:
+        terms = " ".join(f'"{word}"*' for word in words)
+        matching_ids = text(
+            "SELECT rowid FROM contacts_fts WHERE contacts_fts MATCH :query"
+        ).bindparams(query=terms).columns(column("rowid"))
+        return Contact.id.in_(matching_ids)
+    
+    return (
+        Contact.first_name.contains(search_term) |
+        Contact.last_name.contains(search_term) |
+        Contact.email.contains(search_term)
+    )
+
 def create_sample_contacts(session: Session):
     """Create sample contacts for demonstration."""
     sample_contacts = [
@@ -184,12 +303,14 @@ def create_sample_contacts(session: Session):
         )
     ]
     
-    # Check if we already have contacts
-    existing_contacts = session.exec(select(Contact)).first()
-    if not existing_contacts:
-        for contact in sample_contacts:
-            session.add(contact)
+    # Check if we already have contacts (fetches a single id, not a whole row)
+    if session.scalar(select(Contact.id).limit(1)) is None:
+        # One executemany INSERT for all rows instead of one ORM INSERT per contact
+        rows = [contact.dict(exclude={"id"}) for contact in sample_contacts]
+        session.execute(Contact.__table__.insert(), rows)
         session.commit()
+        # Refresh the query planner's statistics for the new data
+        session.exec(text("ANALYZE"))
         print(f"Created {len(sample_contacts)} sample contacts")
 
 # Create sample data on startup
@@ -200,33 +321,35 @@ with Session(engine) as session:
 # 4. API ENDPOINTS - Database-Backed CRUD
 # =============================================================================
 
+_ROOT_JSON = json.dumps({
+    "message": "Contact Book API - Database Fundamentals",
+    "description": "Learn database integration through contact management",
+    "database": {
+        "type": "SQLite",
+        "file": DATABASE_URL,
+        "tables": ["contacts"]
+    },
+    "endpoints": {
+        "GET /contacts": "List all contacts (with filtering)",
+        "POST /contacts": "Create a new contact",
+        "GET /contacts/{id}": "Get a specific contact by ID",
+        "PUT /contacts/{id}": "Update a contact completely",
+        "PATCH /contacts/{id}": "Update specific contact fields",
+        "DELETE /contacts/{id}": "Delete a contact"
+    },
+    "documentation": "/docs"
+}).encode()
+
 @app.get("/", tags=["Info"])
 async def root():
     """API information and available endpoints."""
-    return {
-        "message": "Contact Book API - Database Fundamentals",
-        "description": "Learn database integration through contact management",
-        "database": {
-            "type": "SQLite",
-            "file": DATABASE_URL,
-            "tables": ["contacts"]
-        },
-        "endpoints": {
-            "GET /contacts": "List all contacts (with filtering)",
-            "POST /contacts": "Create a new contact",
-            "GET /contacts/{id}": "Get a specific contact by ID",
-            "PUT /contacts/{id}": "Update a contact completely",
-            "PATCH /contacts/{id}": "Update specific contact fields",
-            "DELETE /contacts/{id}": "Delete a contact"
-        },
-        "documentation": "/docs"
-    }
+    return Response(content=_ROOT_JSON, media_type="application/json")
 
 # =============================================================================
 # READ OPERATIONS - Database Queries
 # =============================================================================
 
-@app.get("/contacts", response_model=List[ContactResponse], tags=["Contacts"])
+@app.get("/contacts", response_model=List[ContactResponse], response_model_exclude_none=True, tags=["Contacts"])
 async def get_contacts(
     session: Session = Depends(get_session),
     contact_type: Optional[ContactType] = Query(None, description="Filter by contact type"),
@@ -245,7 +368,7 @@ async def get_contacts(
     - Pagination with LIMIT and OFFSET
     """
     # Start with base query
-    query = select(Contact)
+    query = select(*CONTACT_LIST_COLUMNS)
     
     # Apply filters
     if contact_type:
@@ -256,22 +379,69 @@ async def get_contacts(
     
     if search:
         # Search in first name, last name, and email
-        search_filter = (
-            Contact.first_name.contains(search) |
-            Contact.last_name.contains(search) |
-            Contact.email.contains(search)
-        )
-        query = query.where(search_filter)
+        query = query.where(contact_search_filter(search))
     
     # Apply pagination
     query = query.offset(skip).limit(limit)
     
     # Execute query
-    contacts = session.exec(query).all()
+    contacts = session.exec(query).mappings().all()
     
     return contacts
 
-@app.get("/contacts/{contact_id}", response_model=ContactResponse, tags=["Contacts"])
+def compute_contact_statistics(session: Session) -> dict:
+    """
+    Aggregate contact statistics.
+    
+    The counting happens in SQL, so no contact rows are loaded into Python.
+    """
+    # COUNT(column) skips NULLs, so one query covers total, company and email
+    total_contacts, contacts_with_company, contacts_with_email = session.exec(
+        select(func.count(), func.count(Contact.company), func.count(Contact.email))
+        .select_from(Contact)
+    ).one()
+    
+    if total_contacts == 0:
+        return {"message": "No contacts found"}
+    
+    # Count by type with a single grouped query
+    type_counts = {contact_type.value: 0 for contact_type in ContactType}
+    for contact_type, count in session.exec(
+        select(Contact.contact_type, func.count()).group_by(Contact.contact_type)
+    ):
+        type_counts[contact_type.value] = count
+    
+    # Find most recent contact (only the columns we need)
+    recent_contact = session.exec(
+        select(Contact.first_name, Contact.last_name)
+        .order_by(Contact.created_at.desc())
+        .limit(1)
+    ).first()
+    
+    return {
+        "total_contacts": total_contacts,
+        "type_breakdown": type_counts,
+        "contacts_with_company": contacts_with_company,
+        "contacts_with_email": contacts_with_email,
+        "most_recent_contact": f"{recent_contact.first_name} {recent_contact.last_name}" if recent_contact else None,
+        "database_file": DATABASE_URL
+    }
+
+@app.get("/contacts/stats", tags=["Statistics"])
+async def get_contact_statistics(session: Session = Depends(get_session)):
+    """
+    Get contact statistics.
+    
+    Demonstrates database aggregation and counting. The result is cached
+    until the next write to the contacts table.
+    """
+    global _stats_cache
+    if _stats_cache is None or _stats_cache[0] != _contacts_version:
+        version = _contacts_version
+        _stats_cache = (version, json.dumps(compute_contact_statistics(session)).encode())
+    return Response(content=_stats_cache[1], media_type="application/json")
+
+@app.get("/contacts/{contact_id}", response_model=ContactResponse, response_model_exclude_none=True, tags=["Contacts"])
 async def get_contact(contact_id: int, session: Session = Depends(get_session)):
     """
     Get a specific contact by its ID.
@@ -317,6 +487,7 @@ async def create_contact(
     # Add to session and commit
     session.add(db_contact)
     session.commit()
+    mark_contacts_changed()
     session.refresh(db_contact)  # Refresh to get the generated ID
     
     return db_contact
@@ -359,6 +530,7 @@ async def update_contact_complete(
     # Commit changes
     session.add(db_contact)
     session.commit()
+    mark_contacts_changed()
     session.refresh(db_contact)
     
     return db_contact
@@ -396,6 +568,7 @@ async def update_contact_partial(
     # Commit changes
     session.add(db_contact)
     session.commit()
+    mark_contacts_changed()
     session.refresh(db_contact)
     
     return db_contact
@@ -428,6 +601,7 @@ async def delete_contact(contact_id: int, session: Session = Depends(get_session
     # Delete from database
     session.delete(db_contact)
     session.commit()
+    mark_contacts_changed()
     
     return JSONResponse(
         status_code=status.HTTP_200_OK,
@@ -441,7 +615,7 @@ async def delete_contact(contact_id: int, session: Session = Depends(get_session
 # ADDITIONAL ENDPOINTS - Advanced Database Operations
 # =============================================================================
 
-@app.get("/contacts/type/{contact_type}", response_model=List[ContactResponse], tags=["Contacts"])
+@app.get("/contacts/type/{contact_type}", response_model=List[ContactResponse], response_model_exclude_none=True, tags=["Contacts"])
 async def get_contacts_by_type(
     contact_type: ContactType,
     session: Session = Depends(get_session)
@@ -451,11 +625,11 @@ async def get_contacts_by_type(
     
     Demonstrates enum-based filtering.
     """
-    statement = select(Contact).where(Contact.contact_type == contact_type)
-    contacts = session.exec(statement).all()
+    statement = select(*CONTACT_LIST_COLUMNS).where(Contact.contact_type == contact_type)
+    contacts = session.exec(statement).mappings().all()
     return contacts
 
-@app.get("/contacts/company/{company_name}", response_model=List[ContactResponse], tags=["Contacts"])
+@app.get("/contacts/company/{company_name}", response_model=List[ContactResponse], response_model_exclude_none=True, tags=["Contacts"])
 async def get_contacts_by_company(
     company_name: str,
     session: Session = Depends(get_session)
@@ -465,11 +639,11 @@ async def get_contacts_by_company(
     
     Demonstrates case-insensitive string matching.
     """
-    statement = select(Contact).where(Contact.company.ilike(f"%{company_name}%"))
-    contacts = session.exec(statement).all()
+    statement = select(*CONTACT_LIST_COLUMNS).where(Contact.company.ilike(f"%{company_name}%"))
+    contacts = session.exec(statement).mappings().all()
     return contacts
 
-@app.get("/contacts/search/{search_term}", response_model=List[ContactResponse], tags=["Contacts"])
+@app.get("/contacts/search/{search_term}", response_model=List[ContactResponse], response_model_exclude_none=True, tags=["Contacts"])
 async def search_contacts(
     search_term: str,
     session: Session = Depends(get_session)
@@ -477,77 +651,24 @@ async def search_contacts(
     """
     Search contacts by name or email.
     
-    Demonstrates complex WHERE conditions with OR logic.
+    Demonstrates full-text search with an SQLite FTS5 index. Each word of
+    the search term matches the start of a word, not any substring.
     """
-    statement = select(Contact).where(
-        Contact.first_name.contains(search_term) |
-        Contact.last_name.contains(search_term) |
-        Contact.email.contains(search_term)
-    )
-    contacts = session.exec(statement).all()
+    statement = select(*CONTACT_LIST_COLUMNS).where(contact_search_filter(search_term))
+    contacts = session.exec(statement).mappings().all()
     return contacts
 
-@app.get("/contacts/stats", tags=["Statistics"])
-async def get_contact_statistics(session: Session = Depends(get_session)):
-    """
-    Get contact statistics.
-    
-    Demonstrates database aggregation and counting.
-    """
-    # Count total contacts
-    total_contacts = len(session.exec(select(Contact)).all())
-    
-    if total_contacts == 0:
-        return {"message": "No contacts found"}
-    
-    # Count by type
-    type_counts = {}
-    for contact_type in ContactType:
-        count = len(session.exec(
-            select(Contact).where(Contact.contact_type == contact_type)
-        ).all())
-        type_counts[contact_type.value] = count
-    
-    # Count contacts with companies
-    contacts_with_company = len(session.exec(
-        select(Contact).where(Contact.company.isnot(None))
-    ).all())
-    
-    # Count contacts with email
-    contacts_with_email = len(session.exec(
-        select(Contact).where(Contact.email.isnot(None))
-    ).all())
-    
-    # Find most recent contact
-    recent_contact = session.exec(
-        select(Contact).order_by(Contact.created_at.desc()).limit(1)
-    ).first()
-    
-    return {
-        "total_contacts": total_contacts,
-        "type_breakdown": type_counts,
-        "contacts_with_company": contacts_with_company,
-        "contacts_with_email": contacts_with_email,
-        "most_recent_contact": f"{recent_contact.first_name} {recent_contact.last_name}" if recent_contact else None,
-        "database_file": DATABASE_URL
-    }
-
 @app.delete("/contacts", tags=["Contacts"])
 async def delete_all_contacts(session: Session = Depends(get_session)):
     """
     Delete all contacts (bulk operation).
     
-    Demonstrates bulk deletion.
+    Demonstrates bulk deletion with a single DELETE statement.
     """
-    # Get count before deletion
-    contacts = session.exec(select(Contact)).all()
-    deleted_count = len(contacts)
-    
-    # Delete all contacts
-    for contact in contacts:
-        session.delete(contact)
-    
+    # Delete all contacts without loading them; rowcount tells us how many
+    deleted_count = session.exec(delete(Contact)).rowcount
     session.commit()
+    mark_contacts_changed()
     
     return JSONResponse(
         status_code=status.HTTP_200_OK,
@@ -565,16 +686,15 @@ async def reset_contacts(session: Session = Depends(get_session)):
     Useful for testing and demonstrations.
     """
     # Delete all existing contacts
-    contacts = session.exec(select(Contact)).all()
-    for contact in contacts:
-        session.delete(contact)
+    session.exec(delete(Contact))
     session.commit()
     
     # Create sample contacts
     create_sample_contacts(session)
+    mark_contacts_changed()
     
     # Count new contacts
-    new_count = len(session.exec(select(Contact)).all())
+    new_count = session.exec(select(func.count()).select_from(Contact)).one()
     
     return JSONResponse(
         status_code=status.HTTP_200_OK,
@@ -584,23 +704,25 @@ async def reset_contacts(session: Session = Depends(get_session)):
         }
     )
 
+# Only the contact count and timestamp change between health checks
+_HEALTH_DATABASE_INFO = {
+    "status": "connected",
+    "type": "SQLite",
+    "url": DATABASE_URL
+}
+
 # Health check with database info
 @app.get("/health", tags=["System"])
 async def health_check(session: Session = Depends(get_session)):
     """Health check endpoint with database connectivity."""
     try:
         # Test database connection
-        contact_count = len(session.exec(select(Contact)).all())
+        contact_count = session.exec(select(func.count()).select_from(Contact)).one()
         
         return {
             "status": "healthy",
             "service": "Contact Book API - Database Fundamentals",
-            "database": {
-                "status": "connected",
-                "type": "SQLite",
-                "url": DATABASE_URL,
-                "contact_count": contact_count
-            },
+            "database": {**_HEALTH_DATABASE_INFO, "contact_count": contact_count},
             "timestamp": datetime.utcnow()
         }
     except Exception as e:
@@ -618,22 +740,24 @@ async def health_check(session: Session = Depends(get_session)):
         )
 
 # Database info endpoint
+_DATABASE_INFO_JSON = json.dumps({
+    "database_type": "SQLite",
+    "database_url": DATABASE_URL,
+    "tables": ["contacts"],
+    "models": ["Contact"],
+    "features": [
+        "CRUD operations",
+        "Text search",
+        "Filtering",
+        "Pagination",
+        "Aggregation"
+    ]
+}).encode()
+
 @app.get("/database/info", tags=["Database"])
 async def database_info():
     """Get information about the database."""
-    return {
-        "database_type": "SQLite",
-        "database_url": DATABASE_URL,
-        "tables": ["contacts"],
-        "models": ["Contact"],
-        "features": [
-            "CRUD operations",
-            "Text search",
-            "Filtering",
-            "Pagination",
-            "Aggregation"
-        ]
-    }
+    return Response(content=_DATABASE_INFO_JSON, media_type="application/json")
 
 # Main execution
 if __name__ == "__main__":
@@ -670,4 +794,13 @@ if __name__ == "__main__":
     print("Press CTRL+C to quit")
     print("=" * 55)
     
-    uvicorn.run(app, host="127.0.0.1", port=8000, reload=True)
\ No newline at end of file
+    # Auto-reload is a development convenience - enable it with RELOAD=1.
+    # uvicorn picks uvloop and httptools automatically when they're installed.
+    # app_dir lets "main:app" resolve even when started from another directory.
+    uvicorn.run(
+        "main:app",
+        host="127.0.0.1",
+        port=8000,
+        reload=os.getenv("RELOAD") == "1",
+        app_dir=os.path.dirname(os.path.abspath(__file__))
+    )
\ No newline at end of file
@@ -184,6 +184,13 @@ def generate_unique_filename(original_filename: str) -> str:
     extension = Path(original_filename).suffix
     return f"{timestamp}_{name}{extension}"
 
+# EXIF tag ids of the fields we keep, looked up once instead of per upload
+EXIF_TAG_IDS = {
+    name: tag_id
+    for tag_id, name in ExifTags.TAGS.items()
+    if name in ("Make", "Model", "DateTime")
+}
+
 def extract_image_metadata(file_path: str) -> dict:
     """Extract metadata from image file."""
     try:
@@ -195,20 +202,21 @@ def extract_image_metadata(file_path: str) -> dict:
             }
             
             # Extract EXIF data if available
-            if hasattr(img, '_getexif'):
-                exif_data = img._getexif()
-                if exif_data:
-                    for tag_id, value in exif_data.items():
-                        tag = ExifTags.TAGS.get(tag_id, tag_id)
-                        if tag == "Make":
-                            metadata["camera_make"] = str(value)
-                        elif tag == "Model":
-                            metadata["camera_model"] = str(value)
-                        elif tag == "DateTime":
-                            try:
-                                metadata["taken_at"] = datetime.strptime(str(value), "%Y:%m:%d %H:%M:%S")
-                            except:
-                                pass
+            get_exif = getattr(img, "_getexif", None)
+            exif_data = get_exif() if get_exif else None
+            if exif_data:
+                make = exif_data.get(EXIF_TAG_IDS["Make"])
+                if make is not None:
+                    metadata["camera_make"] = str(make)
+                model = exif_data.get(EXIF_TAG_IDS["Model"])
+                if model is not None:
+                    metadata["camera_model"] = str(model)
+                taken_at = exif_data.get(EXIF_TAG_IDS["DateTime"])
+                if taken_at is not None:
+                    try:
+                        metadata["taken_at"] = datetime.strptime(str(taken_at), "%Y:%m:%d %H:%M:%S")
+                    except:
+                        pass
             
             return metadata
     except Exception as e:
@@ -22,17 +22,19 @@ Author: bug6129
 from typing import List, Optional, Union
 from datetime import datetime, timedelta
 from enum import Enum
+import os
 import secrets
 from jose import JWTError, jwt
-from passlib.context import CryptContext
+import bcrypt
 from sqlmodel import SQLModel, Field, create_engine, Session, select
 from fastapi import (
     FastAPI, HTTPException, status, Depends, 
     Form, Header, Query
 )
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from fastapi.responses import JSONResponse
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, field_validator
 
 # Create FastAPI app
 app = FastAPI(
@@ -50,8 +52,12 @@ SECRET_KEY = "your-secret-key-change-this-in-production-make-it-long-and-random"
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Password hashing (bcrypt cost factor) - lower it (minimum 4) for fast
+# local development and tests, keep 12 or more in production
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+
+# bcrypt only uses the first 72 bytes of a password (bcrypt 5+ raises instead)
+BCRYPT_MAX_PASSWORD_BYTES = 72
 
 # HTTP Bearer token security
 security = HTTPBearer()
@@ -87,7 +93,15 @@ class UserCreate(SQLModel):
     """Model for user registration."""
     email: EmailStr = Field(..., description="Valid email address")
     full_name: str = Field(..., description="User's full name", max_length=100)
-    password: str = Field(..., description="Password (min 8 characters)", min_length=8)
+    password: str = Field(..., description="Password (min 8 characters, max 72 bytes)", min_length=8)
+    
+    @field_validator("password")
+    @classmethod
+    def password_fits_bcrypt(cls, password: str) -> str:
+        """Reject passwords bcrypt can't hash in full."""
+        if len(password.encode("utf-8")) > BCRYPT_MAX_PASSWORD_BYTES:
+            raise ValueError(f"Password must be at most {BCRYPT_MAX_PASSWORD_BYTES} bytes long")
+        return password
 
 class UserLogin(SQLModel):
     """Model for user login."""
@@ -178,13 +192,29 @@ create_db_and_tables()
 # 4. AUTHENTICATION UTILITIES
 # =============================================================================
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
+# Hash checked when there is no usable stored hash, so failed logins take
+# the same time whether or not the account exists
+_DUMMY_HASH = bcrypt.hashpw(b"dummy_password_for_timing", bcrypt.gensalt(rounds=BCRYPT_ROUNDS))
+
+def verify_password(plain_password: str, hashed_password: Optional[str]) -> bool:
     """Verify a password against its hash."""
-    return pwd_context.verify(plain_password, hashed_password)
+    password = plain_password.encode("utf-8")
+    if len(password) > BCRYPT_MAX_PASSWORD_BYTES:
+        # Registration never accepts such a password, so it can't match - but
+        # still spend the time of a real check
+        bcrypt.checkpw(password[:BCRYPT_MAX_PASSWORD_BYTES], _DUMMY_HASH)
+        return False
+    if hashed_password:
+        try:
+            return bcrypt.checkpw(password, hashed_password.encode("utf-8"))
+        except ValueError:
+            pass  # Malformed hash - fall through to the dummy check
+    bcrypt.checkpw(password, _DUMMY_HASH)
+    return False
 
 def get_password_hash(password: str) -> str:
     """Hash a password for secure storage."""
-    return pwd_context.hash(password)
+    return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(rounds=BCRYPT_ROUNDS)).decode("utf-8")
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT access token."""
@@ -211,9 +241,8 @@ def get_user_by_id(session: Session, user_id: int) -> Optional[User]:
 def authenticate_user(session: Session, email: str, password: str) -> Optional[User]:
     """Authenticate user with email and password."""
     user = get_user_by_email(session, email)
-    if not user:
-        return None
-    if not verify_password(password, user.hashed_password):
+    # Always run a bcrypt check, even for unknown emails
+    if not verify_password(password, user.hashed_password if user else None):
         return None
     return user
 
@@ -451,8 +480,8 @@ async def register_user(user_data: UserCreate, session: Session = Depends(get_se
             detail="Email address already registered"
         )
     
-    # Create new user with hashed password
-    hashed_password = get_password_hash(user_data.password)
+    # Create new user with hashed password (bcrypt is slow, so keep it off the event loop)
+    hashed_password = await run_in_threadpool(get_password_hash, user_data.password)
     db_user = User(
         email=user_data.email,
         full_name=user_data.full_name,
@@ -487,8 +516,10 @@ async def login_user(user_credentials: UserLogin, session: Session = Depends(get
     - Login timestamp tracking
     - Error handling for invalid credentials
     """
-    # Authenticate user
-    user = authenticate_user(session, user_credentials.email, user_credentials.password)
+    # Authenticate user (bcrypt verification runs in a worker thread)
+    user = await run_in_threadpool(
+        authenticate_user, session, user_credentials.email, user_credentials.password
+    )
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,